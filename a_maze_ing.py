@@ -4,32 +4,95 @@ Main module
 """
 
 from sys import argv, exit
+from pathlib import Path
+from random import Random
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
 from pathfinder import PathFinder
 import mazegen
 from mazegen import MazeGenerator, Visualizer
 
 
+def generate_one(config_file: str, seed: int, output: str) -> str:
+    """Generate one maze with its path and save it (batch worker).
+
+    Args:
+        config_file: Path to configuration file.
+        seed: Seed for this maze.
+        output: Output file for this maze.
+
+    Returns:
+        The output file written.
+    """
+    maze = MazeGenerator()
+    maze.read(config_file)
+    maze.seed = seed
+    maze.output = output
+    maze.generate()
+    maze.write()
+    PathFinder(output).save_path()
+    return output
+
+
+def batch(config_file: str, count: int) -> None:
+    """Generate `count` mazes in parallel worker processes.
+
+    Each maze gets its own seed drawn from the configured SEED (or from
+    OS entropy when unset) and is written next to OUTPUT_FILE with an
+    index suffix, e.g. maze_0.txt, maze_1.txt.
+
+    Args:
+        config_file: Path to configuration file.
+        count: Number of mazes to generate.
+    """
+    maze = MazeGenerator()
+    maze.read(config_file)
+    assert maze.output is not None
+    rng = Random(maze.seed)
+    seeds = [rng.getrandbits(32) for _ in range(count)]
+    out = Path(maze.output)
+    outputs = [
+        str(out.with_name(f"{out.stem}_{i}{out.suffix}"))
+        for i in range(count)
+    ]
+    with ProcessPoolExecutor() as pool:
+        done = pool.map(generate_one, repeat(config_file), seeds, outputs)
+        for output in done:
+            print(f"Maze written to {output}")
+
+
 def a_maze_ing(argv: list[str]) -> None:
     """Run maze generator and visualizer.
 
     Args:
         config_file: Path to configuration file.
     """
-    if len(argv) != 2:
-        print("Usage: python3 a_maze_ing.py config.txt")
+    count = 0
+    if len(argv) == 4 and argv[2] == "--batch" and argv[3].isdigit():
+        count = int(argv[3])
+    if count < 1 and len(argv) != 2:
+        print("Usage: python3 a_maze_ing.py config.txt [--batch N]")
         exit(1)
     try:
+        if count:
+            batch(argv[1], count)
+            return
         maze = MazeGenerator()
         maze.read(argv[1])
         assert maze.output is not None
+        vis = Visualizer()
         regenerate = True
         while regenerate:
             maze.generate()
             maze.write()
-            path = PathFinder(maze.output)
-            path.save_path()
-            vis = Visualizer()
-            vis.read(maze.output)
+            assert maze.grid is not None
+            assert maze.entry is not None
+            assert maze.exit is not None
+            path = PathFinder.from_grid(
+                maze.grid, maze.entry, maze.exit, maze.output
+            )
+            solution = path.save_path()
+            vis.read_grid(maze.grid, maze.entry, maze.exit, solution or "")
             regenerate, maze.seed = vis.render()
             maze.reset()
     except Exception as e:
@@ -5,59 +5,83 @@ Generates perfect mazes (no loops).
 """
 
 from __future__ import annotations
-from random import shuffle, seed
-from .mask_42 import make_p42_mask
+from random import Random
+from .mask_42 import make_p42_mask, check_endpoints
 from .imperfect import make_imperfect
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable
 
 if TYPE_CHECKING:
     from .mazegen import MazeGenerator
 
 
+def _carve(
+    cells: bytearray,
+    height: int,
+    width: int,
+    entry: tuple[int, int],
+    blocked: set[tuple[int, int]] | None,
+    randrange: Callable[[int], int],
+) -> None:
+    """
+    Iterative backtracking kernel of the depth-first search
+
+    :param cells: Flat maze cells to carve in place
+    :param height: Number of rows
+    :param width: Number of columns
+    :param entry: Starting cell as (row, column)
+    :param blocked: Cells of the 42 mask that must stay closed
+    :param randrange: Bound randrange of the generator's Random
+    """
+    stride = width + 2
+    offsets = (-stride, 1, stride, -1)
+    steps = (-width, 1, width, -1)
+    carve = (0b1110, 0b1101, 0b1011, 0b0111)
+    carve_opposite = (0b1011, 0b0111, 0b1110, 0b1101)
+    order = [0, 1, 2, 3]
+    visited = bytearray(b"\x01") * ((height + 2) * stride)
+    for x in range(1, height + 1):
+        visited[x * stride + 1:x * stride + 1 + width] = bytes(width)
+    if blocked:
+        for bx, by in blocked:
+            visited[(bx + 1) * stride + by + 1] = 1
+    stack = [0] * (height * width)
+    top = 0
+    stack[0] = (entry[0] + 1) * stride + entry[1] + 1
+    visited[stack[0]] = 1
+    while top >= 0:
+        cell = stack[top]
+        for k in (3, 2, 1):
+            j = randrange(k + 1)
+            order[k], order[j] = order[j], order[k]
+        for i in order:
+            nxt = cell + offsets[i]
+            if not visited[nxt]:
+                visited[nxt] = 1
+                top += 1
+                stack[top] = nxt
+                f = cell - width - 1 - 2 * (cell // stride)
+                cells[f] &= carve[i]
+                cells[f + steps[i]] &= carve_opposite[i]
+                break
+        else:
+            top -= 1
+
+
 def dfs(maze: MazeGenerator) -> None:
     """
     Depth-first-search algorim used by the MazeGenerator class
 
     :param maze: MazeGenerator class
     """
-    assert maze.entry is not None
-    assert maze.exit is not None
-    assert maze.height is not None
-    assert maze.width is not None
-    assert maze.grid is not None
+    cells, width, height = maze.cells, maze.width, maze.height
+    entry, exit = maze.entry, maze.exit
+    if cells is None or width is None or height is None or entry is None:
+        raise ValueError("Grid/size/entry not set")
 
     blocked = make_p42_mask(maze)
-    if blocked:
-        if maze.entry in blocked:
-            msg = f"Entry point {maze.entry} is inside the 42 (blocked) mask."
-            raise ValueError(msg)
-        if maze.exit in blocked:
-            msg = f"Exit point {maze.exit} is inside the 42 (blocked) mask."
-            raise ValueError(msg)
-    seed(maze.seed)
-    stack: list[tuple[int, int]] = [maze.entry]
-    visited: set[tuple[int, int]] = {maze.entry}
-    neighbors = [(-1, 0), (0, 1), (1, 0), (0, -1)]
-    opposite_wall = [2, 3, 0, 1]
-    dir = neighbors.copy()
-    while stack:
-        x, y = stack[-1]
-        shuffle(dir)
-        moved = False
-        for dx, dy in dir:
-            if 0 <= x + dx < maze.height and 0 <= y + dy < maze.width:
-                if blocked and (x + dx, y + dy) in blocked:
-                    continue
-                if (x + dx, y + dy) not in visited:
-                    stack.append((x + dx, y + dy))
-                    visited.add((x + dx, y + dy))
-                    i = neighbors.index((dx, dy))
-                    maze.grid[x][y] &= ~(1 << i)
-                    maze.grid[x + dx][y + dy] &= ~(1 << opposite_wall[i])
-                    moved = True
-                    break
-        if not moved:
-            stack.pop()
+    start = check_endpoints(entry, exit, width, height, blocked)
+    rng = Random(maze.seed)
+    _carve(cells, height, width, start, blocked, rng.randrange)
 
     if not maze.perfect:
-        make_imperfect(maze, blocked)
+        make_imperfect(maze, blocked, rng=rng)
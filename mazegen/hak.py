@@ -1,12 +1,104 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
-from random import seed, choice
-from .mask_42 import make_p42_mask
+from typing import TYPE_CHECKING, Callable
+from random import Random
+from .mask_42 import make_p42_mask, check_endpoints
 from .imperfect import make_imperfect
 
 if TYPE_CHECKING:
     from .mazegen import MazeGenerator
 
+VISITED = 1
+# Blocked cells and the border around the grid
+BLOCKED = 2
+# Masks clearing the wall towards direction i, and the opposite wall
+# of the neighbour it leads to (N/S and E/W swapped).
+CARVE = (0b1110, 0b1101, 0b1011, 0b0111)
+CARVE_OPP = (0b1011, 0b0111, 0b1110, 0b1101)
+
+
+def _carve(
+    cells: bytearray,
+    visited: bytearray,
+    width: int,
+    p: int,
+    f: int,
+    remaining: int,
+    randrange: Callable[[int], int],
+) -> None:
+    """
+    Hunt-and-kill kernel running both the kill and the hunt stage
+
+    :param cells: Flat maze cells, x * width + y
+    :param visited: Cell states with a blocked border
+    :param width: Number of columns
+    :param p: Index of the entry cell in visited
+    :param f: Index of the entry cell in cells
+    :param remaining: Number of cells left to carve
+    :param randrange: Bound randrange of the generator's Random
+    """
+    stride = width + 2
+    offsets = (-stride, 1, stride, -1)
+    steps = (-width, 1, width, -1)
+    up, right, down, left = offsets
+    nbrs = [0] * 4
+    first_open = 0
+    while remaining:
+        n = 0
+        if not visited[p + up]:
+            nbrs[n] = 0
+            n += 1
+        if not visited[p + right]:
+            nbrs[n] = 1
+            n += 1
+        if not visited[p + down]:
+            nbrs[n] = 2
+            n += 1
+        if not visited[p + left]:
+            nbrs[n] = 3
+            n += 1
+
+        if n:
+            i = nbrs[randrange(n)]
+
+            cells[f] &= CARVE[i]
+            p += offsets[i]
+            f += steps[i]
+            cells[f] &= CARVE_OPP[i]
+
+            visited[p] = VISITED
+            remaining -= 1
+            continue
+
+        first_open = visited.find(0, first_open)
+        p = first_open
+        while p != -1:
+            if visited[p + up] == VISITED:
+                nbrs[n] = 0
+                n += 1
+            if visited[p + right] == VISITED:
+                nbrs[n] = 1
+                n += 1
+            if visited[p + down] == VISITED:
+                nbrs[n] = 2
+                n += 1
+            if visited[p + left] == VISITED:
+                nbrs[n] = 3
+                n += 1
+            if n:
+                break
+            p = visited.find(0, p + 1)
+        else:
+            return
+
+        i = nbrs[randrange(n)]
+
+        f = p - width - 1 - 2 * (p // stride)
+        cells[f] &= CARVE[i]
+        cells[f + steps[i]] &= CARVE_OPP[i]
+
+        visited[p] = VISITED
+        remaining -= 1
+
 
 def hak(maze: MazeGenerator) -> None:
     """
@@ -16,103 +108,28 @@ def hak(maze: MazeGenerator) -> None:
     - Hunt phase: scan for an unvisited cell next to a visited one
     """
 
-    assert maze.grid is not None
-    assert maze.width is not None
-    assert maze.height is not None
-    assert maze.entry is not None
+    cells, width, height = maze.cells, maze.width, maze.height
+    entry, exit = maze.entry, maze.exit
+    if cells is None or width is None or height is None or entry is None:
+        raise ValueError("Grid/size/entry not set")
 
-    seed(maze.seed)
+    rng = Random(maze.seed)
+    randrange = rng.randrange
     blocked = make_p42_mask(maze)
+    start = check_endpoints(entry, exit, width, height, blocked)
+    stride = width + 2
+    visited = bytearray([BLOCKED]) * ((height + 2) * stride)
+    for x in range(1, height + 1):
+        visited[x * stride + 1:x * stride + 1 + width] = bytes(width)
     if blocked:
-        if maze.entry in blocked:
-            msg = f"Entry point {maze.entry} is inside the 42 (blocked) mask."
-            raise ValueError(msg)
-        if maze.exit in blocked:
-            msg = f"Exit point {maze.exit} is inside the 42 (blocked) mask."
-            raise ValueError(msg)
-    width = maze.width
-    height = maze.height
-    grid = maze.grid
-    visited = set()
-    DIRS = [(-1, 0), (0, 1), (1, 0), (0, -1)]
-    OPP = [2, 3, 0, 1]
-
-    cx, cy = maze.entry
-    visited.add((cx, cy))
-
-    def kill(x: int, y: int) -> tuple[int, int]:
-        """
-        Hunt stage of the algoruithm
-
-        :param x: Coordinate
-        :param y: Coordinate
-        """
-        while True:
-            neighbors = []
-
-            for i, (dx, dy) in enumerate(DIRS):
-                nx, ny = x + dx, y + dy
-                if 0 <= nx < height and 0 <= ny < width:
-                    if blocked:
-                        if (nx, ny) not in visited and (nx, ny) not in blocked:
-                            neighbors.append((nx, ny, i))
-                    else:
-                        if (nx, ny) not in visited:
-                            neighbors.append((nx, ny, i))
-
-            if not neighbors:
-                return x, y
-
-            nx, ny, i = choice(neighbors)
-
-            grid[x][y] &= ~(1 << i)
-            grid[nx][ny] &= ~(1 << OPP[i])
-
-            visited.add((nx, ny))
-            x, y = nx, ny
-
-    def hunt() -> tuple[int, int] | None:
-        """
-        Hunt stage of the algorithm
-        """
-        for x in range(height):
-            for y in range(width):
-                if blocked:
-                    if (x, y) in visited or (x, y) in blocked:
-                        continue
-                else:
-                    if (x, y) in visited:
-                        continue
-
-                candidates = []
-                for i, (dx, dy) in enumerate(DIRS):
-                    nx, ny = x + dx, y + dy
-                    if 0 <= nx < height and 0 <= ny < width:
-                        if blocked:
-                            if (nx, ny) in visited and (x, y) not in blocked:
-                                candidates.append((nx, ny, i))
-                        else:
-                            if (nx, ny) in visited:
-                                candidates.append((nx, ny, i))
-
-                if candidates:
-                    nx, ny, i = choice(candidates)
-
-                    grid[x][y] &= ~(1 << i)
-                    grid[nx][ny] &= ~(1 << OPP[i])
-
-                    visited.add((x, y))
-                    return x, y
-
-        return None
-
-    x, y = cx, cy
-    while True:
-        x, y = kill(x, y)
-        found = hunt()
-        if not found:
-            break
-        x, y = found
+        for bx, by in blocked:
+            visited[(bx + 1) * stride + by + 1] = BLOCKED
+
+    x, y = start
+    p = (x + 1) * stride + y + 1
+    visited[p] = VISITED
+    remaining = width * height - 1 - (len(blocked) if blocked else 0)
+    _carve(cells, visited, width, p, x * width + y, remaining, randrange)
 
     if not maze.perfect:
-        make_imperfect(maze, blocked)
+        make_imperfect(maze, blocked, rng=rng)
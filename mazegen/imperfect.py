@@ -1,19 +1,31 @@
 from __future__ import annotations
-from random import random
+from random import Random, random
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .mazegen import MazeGenerator
 
+# Maps a cell's wall bits to 1 when exactly one wall is open (dead end)
+DEAD_END = bytes(
+    1 if bin(~v & 0xF).count("1") == 1 else 0 for v in range(256)
+)
+
 
 def make_imperfect(
     maze: MazeGenerator,
     blocked: set[tuple[int, int]] | None,
     probability: float = 0.5,
+    rng: Random | None = None,
 ) -> None:
     """
     Remove some walls to create loops (imperfect maze).
     probability: chance to remove a wall at each dead end.
+    rng: generator's Random instance, the random module if omitted.
+
+    The flat cell buffer is translated through the DEAD_END table in one
+    C call and only the dead ends it flags are visited from Python. A
+    flagged cell is checked again before use because carving an earlier
+    cell may have opened it.
     """
     neighbors = [(-1, 0), (0, 1), (1, 0), (0, -1)]
     opposite_wall = [2, 3, 0, 1]
@@ -21,26 +33,29 @@ def make_imperfect(
     assert maze.height is not None
     assert maze.width is not None
     assert maze.grid is not None
+    assert maze.cells is not None
+    grid = maze.grid
+    width = maze.width
+    marks = maze.cells.translate(DEAD_END)
+    rand = rng.random if rng is not None else random
     for x in range(maze.height):
-        for y in range(maze.width):
-            if blocked and (x, y) in blocked:
-                continue
-            open_count = 0
-            for i in range(4):
-                if not (maze.grid[x][y] & (1 << i)):
-                    open_count += 1
-            if open_count != 1:
-                continue
-            for i, (dx, dy) in enumerate(neighbors):
-                nx, ny = x + dx, y + dy
-                if not (0 <= nx < maze.height and 0 <= ny < maze.width):
-                    continue
-                if blocked and (nx, ny) in blocked:
-                    continue
-                if (maze.grid[x][y] & (1 << i)) and (
-                    maze.grid[nx][ny] & (1 << opposite_wall[i])
-                ):
-                    if random() < probability:
-                        maze.grid[x][y] &= ~(1 << i)
-                        maze.grid[nx][ny] &= ~(1 << opposite_wall[i])
-                    break
+        row = grid[x]
+        base = x * width
+        y = marks.find(1, base, base + width)
+        while y != -1:
+            y -= base
+            if DEAD_END[row[y]]:
+                for i, (dx, dy) in enumerate(neighbors):
+                    nx, ny = x + dx, y + dy
+                    if not (0 <= nx < maze.height and 0 <= ny < maze.width):
+                        continue
+                    if blocked and (nx, ny) in blocked:
+                        continue
+                    if (row[y] & (1 << i)) and (
+                        grid[nx][ny] & (1 << opposite_wall[i])
+                    ):
+                        if rand() < probability:
+                            row[y] &= ~(1 << i)
+                            grid[nx][ny] &= ~(1 << opposite_wall[i])
+                        break
+            y = marks.find(1, base + y + 1, base + width)
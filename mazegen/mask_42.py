@@ -74,3 +74,34 @@ def make_p42_mask(maze: MazeGenerator) -> set[tuple[int, int]] | None:
             if 0 <= x < maze.width and 0 <= y < maze.height:
                 blocked.add((y, x))
     return blocked
+
+
+def check_endpoints(
+    entry: tuple[int, int],
+    exit: tuple[int, int] | None,
+    width: int,
+    height: int,
+    blocked: set[tuple[int, int]] | None,
+) -> tuple[int, int]:
+    """
+    Check the entry and exit against the grid and the 42 mask
+    Used by the dfs and hak maze generators
+
+    :param entry: Entry point as (x, y), as in the config
+    :param exit: Exit point as (x, y), as in the config
+    :param width: Number of columns
+    :param height: Number of rows
+    :param blocked: Cells of the 42 mask as (row, column)
+    :return: Entry cell as (row, column)
+    """
+    ex, ey = entry
+    if not (0 <= ex < width and 0 <= ey < height):
+        raise ValueError("entry coordinates out of bounds")
+    if blocked:
+        if (ey, ex) in blocked:
+            msg = f"Entry point {entry} is inside the 42 (blocked) mask."
+            raise ValueError(msg)
+        if exit is not None and (exit[1], exit[0]) in blocked:
+            msg = f"Exit point {exit} is inside the 42 (blocked) mask."
+            raise ValueError(msg)
+    return ey, ex
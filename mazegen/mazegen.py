@@ -1,9 +1,11 @@
-from typing import Union, TypedDict, cast
+from typing import Sequence, Union, TypedDict, cast
 from pathlib import Path
 from os import PathLike, access, R_OK
 from .dfs import dfs
 from .hak import hak
 
+HEX_TABLE = bytes.maketrans(bytes(range(16)), b"0123456789ABCDEF")
+
 
 class Config(TypedDict):
     width: int
@@ -18,7 +20,8 @@ class Config(TypedDict):
 
 class MazeGenerator:
     def __init__(self) -> None:
-        self._grid: list[list[int]] | None = None
+        self._cells: bytearray | None = None
+        self._grid: list[memoryview] | None = None
         self._output: Union[str, PathLike[str]] | None = None
         self._width: int | None = None
         self._height: int | None = None
@@ -29,12 +32,21 @@ class MazeGenerator:
         self._algorithm: str | None = None
 
     @property
-    def grid(self) -> list[list[int]] | None:
+    def cells(self) -> bytearray | None:
+        return self._cells
+
+    @property
+    def grid(self) -> list[memoryview] | None:
         return self._grid
 
     @grid.setter
-    def grid(self, grid: list[list[int]]) -> None:
-        self._grid = grid
+    def grid(self, grid: Sequence[Sequence[int]]) -> None:
+        width = len(grid[0]) if grid else 0
+        self._allocate(width, len(grid))
+        self._width = width
+        self._height = len(grid)
+        assert self._cells is not None
+        self._cells[:] = b"".join(bytes(row) for row in grid)
 
     @property
     def output(self) -> Union[str, PathLike[str]] | None:
@@ -130,12 +142,16 @@ class MazeGenerator:
                 key, val = map(str.strip, line.split("=", 1))
                 key = key.lower()
 
-                if key != "perfect" and val.strip("-").isdigit():
-                    iv = int(val)
-                    if iv < 0:
-                        raise ValueError(f"{key} must be non-negative")
-                    raw[key] = iv
-                    continue
+                if key != "perfect":
+                    try:
+                        iv = int(val)
+                    except ValueError:
+                        pass
+                    else:
+                        if iv < 0:
+                            raise ValueError(f"{key} must be non-negative")
+                        raw[key] = iv
+                        continue
 
                 lowered = val.lower()
                 if lowered in ("true", "1", "on", "yes"):
@@ -146,14 +162,16 @@ class MazeGenerator:
                     continue
 
                 if "," in val:
-                    parts = [p.strip() for p in val.split(",")]
+                    parts = val.split(",")
                     if len(parts) != 2:
                         msg = f"{key} must contain exactly two integers"
                         raise ValueError(msg)
-                    if not all(p.strip("-").isdigit() for p in parts):
-                        raise ValueError(f"{key} must contain only integers")
-                    ints = tuple(map(int, parts))
-                    if any(x < 0 for x in ints):
+                    try:
+                        ints = (int(parts[0]), int(parts[1]))
+                    except ValueError:
+                        msg = f"{key} must contain only integers"
+                        raise ValueError(msg)
+                    if ints[0] < 0 or ints[1] < 0:
                         msg = f"{key} must contain non-negative integers"
                         raise ValueError(msg)
                     raw[key] = ints
@@ -194,9 +212,7 @@ class MazeGenerator:
         if config["entry"] == config["exit"]:
             raise ValueError("entry and exit must be different")
 
-        i_width = range(config["width"])
-        i_height = range(config["height"])
-        self._grid = [[15 for _ in i_width] for _ in i_height]
+        self._allocate(config["width"], config["height"])
         self._width = config["width"]
         self._height = config["height"]
         self._entry = config["entry"]
@@ -210,17 +226,21 @@ class MazeGenerator:
         if self._grid is None or self._output is None:
             return
 
-        with open(self._output, "w") as fp:
-            for row in self._grid:
-                fp.write("".join(hex(v)[2:].upper() for v in row))
-                fp.write("\n")
-
-            fp.write("\n")
-
-            if self._entry:
-                fp.write(f"{self._entry[0]}, {self._entry[1]}\n")
-            if self._exit:
-                fp.write(f"{self._exit[0]}, {self._exit[1]}\n")
+        assert self._cells is not None
+        hexed = memoryview(self._cells.translate(HEX_TABLE))
+        w = len(self._grid[0]) if self._grid else 0
+        lines: list[bytes | memoryview] = [
+            hexed[i * w:(i + 1) * w] for i in range(len(self._grid))
+        ]
+        lines.append(b"")
+        if self._entry:
+            lines.append(f"{self._entry[0]}, {self._entry[1]}".encode())
+        if self._exit:
+            lines.append(f"{self._exit[0]}, {self._exit[1]}".encode())
+        lines.append(b"")
+
+        with open(self._output, "wb") as fp:
+            fp.write(b"\n".join(lines))
 
     def generate(self) -> None:
         match self._algorithm:
@@ -234,6 +254,18 @@ class MazeGenerator:
     def reset(self) -> None:
         if self._width is None or self._height is None:
             raise ValueError("Width/height not set")
-        i_width = range(self._width)
-        i_height = range(self._height)
-        self._grid = [[15 for _ in i_width] for _ in i_height]
+        cells = self._cells
+        if (
+            cells is None
+            or self._grid is None
+            or len(self._grid) != self._height
+            or len(cells) != self._width * self._height
+        ):
+            self._allocate(self._width, self._height)
+            return
+        cells[:] = b"\x0f" * len(cells)
+
+    def _allocate(self, width: int, height: int) -> None:
+        self._cells = bytearray(b"\x0f") * (width * height)
+        view = memoryview(self._cells)
+        self._grid = [view[i * width:(i + 1) * width] for i in range(height)]
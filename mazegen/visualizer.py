@@ -5,8 +5,8 @@ This will display the maze to stdout
 Ref: https://gist.github.com/fnky/458719343aabd01cfb17a3a4f7296797
 """
 
-from os import PathLike
-from typing import Union, Any
+from os import PathLike, read
+from typing import Union, Any, Sequence
 from enum import IntEnum
 from shutil import get_terminal_size
 from sys import stdout, stdin
@@ -14,6 +14,30 @@ from select import select
 from termios import tcgetattr, tcsetattr, TCSADRAIN
 from tty import setcbreak
 from time import sleep
+from functools import lru_cache
+from bisect import bisect_left
+from operator import itemgetter
+
+# Junction glyph for each mask of wall arms meeting at a corner
+# (1 = up, 2 = right, 4 = down, 8 = left)
+JUNCTIONS = (
+    " ", "╵", "╶", "╰", "╷", "│", "╭", "├",
+    "╴", "╯", "─", "┴", "╮", "┤", "┬", "┼",
+)
+# Map wall bits to 1 when a cell has its N, E, S or W wall
+HAS_N, HAS_E, HAS_S, HAS_W = (
+    bytes(1 if v & bit else 0 for v in range(256)) for bit in (1, 2, 4, 8)
+)
+# Map a wall flag to the JUNCTIONS index of a straight wall
+H_WALL = bytes((0, 10)) + bytes(254)
+V_WALL = bytes((0, 5)) + bytes(254)
+# Turns a line of JUNCTIONS indexes, read as latin-1, into glyphs
+GLYPHS = str.maketrans(dict(enumerate(JUNCTIONS)))
+# Maps a hex digit of the maze file to its value, anything else to 0xFF
+FROM_HEX = bytes(
+    int(chr(v), 16) if chr(v) in "0123456789ABCDEFabcdef" else 0xFF
+    for v in range(256)
+)
 
 
 class Point:
@@ -30,23 +54,11 @@ class Point:
         self.y = y
 
 
-class Cell(Point):
-    """Represents a maze cell with position and wall configuration."""
-
-    def __init__(self, x: int, y: int, walls: int = 0) -> None:
-        """Initialize cell at coordinates (x, y) with wall configuration.
-
-        Args:
-            x: X coordinate.
-            y: Y coordinate.
-            walls: Wall configuration as bit flags (default: 0).
-        """
-        super().__init__(x, y)
-        self.walls = walls
-
-
 class Graphics:
-    """ANSI escape code utilities for terminal graphics."""
+    """ANSI escape code utilities for terminal graphics.
+
+    Helpers return escape sequences rather than writing them to stdout.
+    """
 
     class Color(IntEnum):
         """ANSI color codes."""
@@ -59,41 +71,56 @@ class Graphics:
         Cyan = 36
         Default = 39
 
+    # Escape sequences selecting each color, as text or as background
+    fg_codes = {c: f"\x1b[{int(c)}m" for c in Color}
+    bg_codes = {c: f"\x1b[{int(c) + 10}m" for c in Color}
+
     @staticmethod
-    def set(color: "Graphics.Color", background: bool = False) -> None:
+    def set(color: "Graphics.Color", background: bool = False) -> str:
         """Set terminal text or background color.
 
         Args:
             color: Color to set.
             background: If True, set background color; otherwise text color.
+
+        Returns:
+            Escape sequence selecting the color.
         """
         if background:
-            stdout.write(f"\x1b{color};{color + 10}m")
-        else:
-            stdout.write(f"\x1b[{color}m")
+            return Graphics.bg_codes[color]
+        return Graphics.fg_codes[color]
 
     @staticmethod
-    def reset() -> None:
-        """Reset terminal colors to default."""
-        stdout.write("\x1b[0m")
+    def reset() -> str:
+        """Reset terminal colors to default.
+
+        Returns:
+            Escape sequence restoring the default colors.
+        """
+        return "\x1b[0m"
 
     @staticmethod
-    def menu(item: str) -> None:
+    def menu(item: str) -> str:
         """Display menu item with first character highlighted.
 
         Args:
             item: Menu item text to display.
+
+        Returns:
+            Menu item with its highlight escape sequences.
         """
-        Graphics.set(Graphics.Color.Cyan)
-        stdout.write(item[0])
-        Graphics.reset()
-        stdout.write(item[1:])
+        return (
+            Graphics.set(Graphics.Color.Cyan)
+            + item[0]
+            + Graphics.reset()
+            + item[1:]
+        )
 
 
 class Visualizer:
     """Interactive terminal-based maze visualizer."""
 
-    menu = {
+    menu: dict[str, Any] = {
         "Main": ["New maze", "Color", "Path", "Quit"],
         "Color": {
             "Walls": ["Red", "Green", "Yellow", "Blue", "Magenta", "Cyan"],
@@ -101,6 +128,22 @@ class Visualizer:
             "Logo": ["Red", "Green", "Yellow", "Blue", "Magenta", "Cyan"],
         },
     }
+    # Color submenu opened by each key of the Color menu
+    submenus = {"w": "Walls", "p": "Path", "l": "Logo"}
+    # Setting changed by each color submenu, and the color of each key
+    color_targets = {
+        "Walls": "wall_color",
+        "Path": "path_color",
+        "Logo": "logo_color",
+    }
+    color_keys = {
+        "r": Graphics.Color.Red,
+        "g": Graphics.Color.Green,
+        "y": Graphics.Color.Yellow,
+        "b": Graphics.Color.Blue,
+        "m": Graphics.Color.Magenta,
+        "c": Graphics.Color.Cyan,
+    }
 
     class Keyboard:
         """Event handler for keyboard input in raw mode."""
@@ -126,124 +169,179 @@ class Visualizer:
             """
             tcsetattr(stdin.fileno(), TCSADRAIN, old)
 
-        @staticmethod
-        def get_key() -> str | None:
-            """Get a single keypress without blocking.
+        pending = b""
+        # Final byte of the CSI / SS3 sequence sent by each arrow key
+        arrows = {b"A": "up", b"B": "down", b"C": "right", b"D": "left"}
+
+        @classmethod
+        def get_key(cls, timeout: float | None = 0) -> str | None:
+            """Get a single keypress, waiting at most `timeout` seconds.
+
+            Args:
+                timeout: Seconds to wait for a key; 0 (default) polls
+                    and None blocks until a key is pressed.
 
             Returns:
                 Key character or special key name
                 ('up', 'down', 'left', 'right'),
                 or None if no key pressed.
             """
-            dr, _, _ = select([stdin], [], [], 0)
-            if not dr:
-                return None
-            ch = stdin.read(1)
-            if ch == "\x1b":
-                ch1 = stdin.read(1)
-                ch2 = stdin.read(1)
-                if ch1 == "[":
-                    if ch2 == "A":
-                        return "up"
-                    if ch2 == "B":
-                        return "down"
-                    if ch2 == "C":
-                        return "right"
-                    if ch2 == "D":
-                        return "left"
-                return ch
-            return ch
+            data = cls.pending
+            fd = stdin.fileno()
+            if not data:
+                if timeout is None:
+                    # Blocking wait: read() sleeps until a key arrives,
+                    # no select() needed
+                    data = read(fd, 32)
+                else:
+                    dr, _, _ = select([fd], [], [], timeout)
+                    if dr:
+                        try:
+                            data = read(fd, 32)
+                        except BlockingIOError:
+                            pass
+                if not data:
+                    return None
+            while data[:1] == b"\x1b":
+                # Pull in the rest of an unterminated CSI / SS3 sequence
+                # (or what may follow a lone Escape) without waiting
+                end = 2
+                if data[1:2] in (b"[", b"O"):
+                    while end < len(data) and not 0x40 <= data[end] <= 0x7E:
+                        end += 1
+                elif len(data) > 1:
+                    break
+                if end < len(data):
+                    break
+                dr, _, _ = select([fd], [], [], 0)
+                if not dr:
+                    break
+                try:
+                    more = read(fd, 32)
+                except BlockingIOError:
+                    break
+                if not more:
+                    break
+                data += more
+            if data[:1] == b"\x1b" and data[1:2] in (b"[", b"O"):
+                # Skip parameters up to the final byte of the sequence
+                end = 2
+                while end < len(data) and not 0x40 <= data[end] <= 0x7E:
+                    end += 1
+                cls.pending = data[end + 1:]
+                return cls.arrows.get(data[end:end + 1], "\x1b")
+            size = 1
+            while size < len(data) and data[size] & 0xC0 == 0x80:
+                size += 1
+            cls.pending = data[size:]
+            return data[:size].decode(errors="ignore") or None
 
     class Cursor:
-        """Terminal cursor manipulation utilities."""
+        """Terminal cursor manipulation utilities.
+
+        Each helper returns its escape sequence instead of writing it,
+        so a frame can be assembled and written in one go. Sequences
+        that take a position or count are cached, as a frame asks for
+        the same ones over and over.
+        """
 
         @staticmethod
-        def up(n: int = 1) -> None:
+        @lru_cache(maxsize=4096)
+        def up(n: int = 1) -> str:
             """Move cursor up by n lines.
 
             Args:
                 n: Number of lines to move (default: 1).
             """
-            stdout.write(f"\x1b[{n}A")
+            return f"\x1b[{n}A"
 
         @staticmethod
-        def up_and_begining(n: int = 1) -> None:
+        @lru_cache(maxsize=4096)
+        def up_and_begining(n: int = 1) -> str:
             """Move cursor up n lines to beginning of line.
 
             Args:
                 n: Number of lines to move (default: 1).
             """
-            stdout.write(f"\x1b[{n}F")
+            return f"\x1b[{n}F"
 
         @staticmethod
-        def down(n: int = 1) -> None:
+        @lru_cache(maxsize=4096)
+        def down(n: int = 1) -> str:
             """Move cursor down by n lines.
 
             Args:
                 n: Number of lines to move (default: 1).
             """
-            stdout.write(f"\x1b[{n}B")
+            return f"\x1b[{n}B"
 
         @staticmethod
-        def right(n: int = 1) -> None:
+        @lru_cache(maxsize=4096)
+        def right(n: int = 1) -> str:
             """Move cursor right by n columns.
 
             Args:
                 n: Number of columns to move (default: 1).
             """
-            stdout.write(f"\x1b[{n}C")
+            return f"\x1b[{n}C"
 
         @staticmethod
-        def left(n: int = 1) -> None:
+        @lru_cache(maxsize=4096)
+        def left(n: int = 1) -> str:
             """Move cursor left by n columns.
 
             Args:
                 n: Number of columns to move (default: 1).
             """
-            stdout.write(f"\x1b[{n}D")
+            return f"\x1b[{n}D"
 
         @staticmethod
-        def save() -> None:
+        def save() -> str:
             """Save current cursor position."""
-            stdout.write("\x1b7")
+            return "\x1b7"
 
         @staticmethod
-        def load() -> None:
+        def load() -> str:
             """Restore saved cursor position."""
-            stdout.write("\x1b8")
+            return "\x1b8"
 
         @staticmethod
-        def hide() -> None:
+        def hide() -> str:
             """Hide terminal cursor."""
-            stdout.write("\x1b[?25l")
+            return "\x1b[?25l"
 
         @staticmethod
-        def show() -> None:
+        def show() -> str:
             """Show terminal cursor."""
-            stdout.write("\x1b[?25h")
+            return "\x1b[?25h"
 
         @staticmethod
-        def home() -> None:
+        def home() -> str:
             """Move cursor to home position (0, 0)."""
-            stdout.write("\x1b[H")
+            return "\x1b[H"
 
         @staticmethod
-        def move_to(x: int, y: int) -> None:
+        @lru_cache(maxsize=4096)
+        def move_to(x: int, y: int) -> str:
             """Move cursor to specific position.
 
             Args:
                 x: Column position (0-indexed).
                 y: Row position (0-indexed).
             """
-            stdout.write(f"\x1b[{y+1};{x+1}H")
+            return f"\x1b[{y+1};{x+1}H"
 
         @staticmethod
-        def clear_line() -> None:
+        def clear_line() -> str:
             """Clear current line and move cursor to beginning."""
-            stdout.write("\x1b[2K\x1b[0G")
+            return "\x1b[2K\x1b[0G"
 
     class Terminal:
-        """Terminal properties and control."""
+        """Terminal properties and control.
+
+        Screen control helpers return their escape sequence, like the
+        Cursor ones.
+        """
 
         def __init__(self) -> None:
             """Initialize terminal with current size."""
@@ -254,23 +352,53 @@ class Visualizer:
             self.width, self.height = get_terminal_size()
 
         @staticmethod
-        def clear() -> None:
+        def clear() -> str:
             """Clear entire terminal screen."""
-            stdout.write("\x1b[2J")
+            return "\x1b[2J"
 
         @staticmethod
-        def enter_alternate() -> None:
+        def begin_sync() -> str:
+            """Start a synchronized update (DEC mode 2026).
+
+            Supporting terminals hold drawing until end_sync(), so a
+            frame is painted at once instead of as it arrives. Others
+            ignore the sequence.
+            """
+            return "\x1b[?2026h"
+
+        @staticmethod
+        def end_sync() -> str:
+            """End a synchronized update and paint the frame."""
+            return "\x1b[?2026l"
+
+        @staticmethod
+        def disable_wrap() -> str:
+            """Stop lines at the right margin instead of wrapping them.
+
+            A line wider than the terminal is then cut off rather than
+            scrolling the screen under the rows already drawn.
+            """
+            return "\x1b[?7l"
+
+        @staticmethod
+        def enable_wrap() -> str:
+            """Wrap lines at the right margin again."""
+            return "\x1b[?7h"
+
+        @staticmethod
+        def enter_alternate() -> str:
             """Enter alternate screen buffer."""
-            stdout.write("\x1b[?1049h")
+            return "\x1b[?1049h"
 
         @staticmethod
-        def exit_alternate() -> None:
+        def exit_alternate() -> str:
             """Exit alternate screen buffer and restore original."""
-            stdout.write("\x1b[?1049l")
+            return "\x1b[?1049l"
 
     def __init__(self) -> None:
         """Initialize visualizer with default settings."""
-        self.maze: list[list[Cell]]
+        # Wall bit flags, one bytes row per maze row
+        self.walls: list[bytes]
         self.start: Point
         self.end: Point
         self.path: list[str]
@@ -281,30 +409,375 @@ class Visualizer:
         self.logo_color: Graphics.Color = Graphics.Color.Yellow
         self.path_symbol: str = "░"
         self.path_drawn = False
+        # Rendered wall rows and the logo cells in row order, built by
+        # _build()
+        self._lines: list[str] = []
+        self._logo_cells: list[tuple[int, int]] = []
+        # Maze rows currently on screen, as last drawn by _draw()
+        self._shown: list[str] = []
+        # Path cells per straight stroke and as (x, y, length) runs,
+        # by _trace()
+        self._strokes: list[list[tuple[int, int]]] = []
+        self._runs: list[tuple[int, int, int]] = []
+        # Output of the frame being drawn, written with a single call
+        self._buf: list[str] = []
+        # Viewport offsets (top-left corner in `_lines`) and size
+        self._off_x = 0
+        self._off_y = 0
+        self._view_w = 1
+        self._view_h = 1
+        # Items of each menu, Color submenus included, and their
+        # rendered menu lines, built by _fit_menus()
+        self._menus: dict[str, Any] = {
+            "Main": Visualizer.menu["Main"],
+            "Color": list(Visualizer.menu["Color"]),
+            **Visualizer.menu["Color"],
+        }
+        self._menu_lines: dict[str, str] = {}
+
+    def _fit_menus(self, width: int) -> None:
+        """Render the line of each menu, cut to the terminal width.
+
+        A longer line would wrap and scroll the whole screen.
+
+        Args:
+            width: Terminal width in columns.
+        """
+        for name, items in self._menus.items():
+            parts = []
+            used = 0
+            for item in items:
+                text = (item + "    ")[:width - used]
+                if not text:
+                    break
+                parts.append(Graphics.menu(text))
+                used += len(text)
+            self._menu_lines[name] = "".join(parts)
 
     def read(self, file: Union[str, PathLike[str]]) -> None:
         """Load maze from output file.
 
+        Can be called again on the same instance to swap in a newly
+        generated maze; display settings such as colors are kept.
+
         Args:
             file: Path to maze file containing grid, entry, exit, and path.
         """
-        maze: list[list[Cell]] = []
-        with open(file, "r") as fp:
-            for y, ln in enumerate(fp):
-                if ln == "\n":
-                    break
-                maze.append(
-                    [Cell(x, y, int(c, 16)) for x, c in enumerate(ln.strip())]
-                )
-            start = Point(*(int(x) for x in fp.readline().strip().split(",")))
-            end = Point(*(int(x) for x in fp.readline().strip().split(",")))
-            path = [c.upper() for c in fp.readline().strip()]
-        self.maze = maze
-        self.start = start
-        self.end = end
-        self.path = path
-        self.width = len(maze[0]) * 3
-        self.height = len(maze) * 3
+        with open(file, "rb") as fp:
+            lines = fp.read().splitlines()
+        # The grid ends at the first blank line
+        blank = lines.index(b"") if b"" in lines else len(lines)
+        rows = [ln.strip().translate(FROM_HEX) for ln in lines[:blank]]
+        for row in rows:
+            if b"\xff" in row:
+                raise ValueError(f"Invalid hex digit in maze file: {file}")
+        info = lines[blank + 1:] + [b""] * 3
+        start = tuple(int(x) for x in info[0].split(b","))
+        end = tuple(int(x) for x in info[1].split(b","))
+        path = info[2].strip().decode("ascii")
+        self.read_grid(rows, (start[0], start[1]), (end[0], end[1]), path)
+
+    def read_grid(
+        self,
+        grid: Sequence[Sequence[int]],
+        entry: tuple[int, int],
+        exit: tuple[int, int],
+        path: str = "",
+    ) -> None:
+        """Load maze straight from memory, without an output file.
+
+        Takes the same data the output file holds, e.g. the grid of a
+        MazeGenerator, so a freshly generated maze can be shown without
+        writing and re-reading it.
+
+        Args:
+            grid: Rows of wall bit flags, indexed grid[y][x].
+            entry: Entry position (x, y).
+            exit: Exit position (x, y).
+            path: Solution as a string of N, E, S, W directions.
+        """
+        walls = [bytes(row) for row in grid]
+        self.walls = walls
+        self.start = Point(*entry)
+        self.end = Point(*exit)
+        self.path = [c.upper() for c in path]
+        self.path_drawn = False
+        self.width = len(walls[0]) * 3
+        self.height = len(walls) * 3
+        self._build()
+        self._trace()
+
+    def _clamp_offsets(self) -> None:
+        """Keep the viewport offsets inside the rendered maze."""
+        max_off_x = max(0, len(self._lines[0]) - self._view_w)
+        max_off_y = max(0, len(self._lines) - self._view_h)
+        self._off_x = min(max(self._off_x, 0), max_off_x)
+        self._off_y = min(max(self._off_y, 0), max_off_y)
+
+    def _to_screen(self, x: int, y: int) -> tuple[int, int]:
+        """Convert a position in the rendered maze to the screen.
+
+        Args:
+            x: Column in the rendered maze.
+            y: Row in the rendered maze.
+
+        Returns:
+            Screen column and row.
+        """
+        return x - self._off_x, y - self._off_y
+
+    def _in_view(self, sx: int, sy: int) -> bool:
+        """Tell whether a screen position is inside the viewport.
+
+        Args:
+            sx: Screen column.
+            sy: Screen row.
+
+        Returns:
+            True if the position is visible.
+        """
+        return 0 <= sx < self._view_w and 0 <= sy < self._view_h
+
+    def _build(self) -> None:
+        """Render maze walls and junctions and cache the rows.
+
+        The maze does not change while it is displayed, so this runs
+        once per maze; refreshes only cut the viewport out of the
+        cached rows.
+
+        Work is done a whole row at a time on bytes: each row is a
+        line of JUNCTIONS indexes, one byte per character. Wall bits
+        are picked out with translate() and the walls of two rows or
+        columns are OR-ed as big integers, whose bytes never carry
+        into each other since they only hold 0 or 1. Corner masks
+        are the four arms shifted into place the same way.
+        """
+        rows = self.walls
+        m_h = len(rows)
+        m_w = len(rows[0])
+        lines: list[str] = []
+
+        def either(a: bytes, b: bytes) -> bytes:
+            value = int.from_bytes(a, "big") | int.from_bytes(b, "big")
+            return value.to_bytes(len(a), "big")
+
+        n = m_w + 1
+        blank = bytes(m_w)
+        # Vertical wall left of each column boundary, per cell row,
+        # with an empty row above and below the maze
+        vertical = [bytes(n)]
+        for row in rows:
+            pad = b"\0" + row + b"\0"
+            vertical.append(
+                either(pad[:-1].translate(HAS_E), pad[1:].translate(HAS_W))
+            )
+        vertical.append(bytes(n))
+
+        line = bytearray(m_w * 2 + 1)
+        above = blank
+        for mi in range(m_h + 1):
+            below = rows[mi] if mi < m_h else blank
+            across = either(above.translate(HAS_S), below.translate(HAS_N))
+            mask = (
+                int.from_bytes(vertical[mi], "big")
+                | int.from_bytes(across + b"\0", "big") << 1
+                | int.from_bytes(vertical[mi + 1], "big") << 2
+                | int.from_bytes(b"\0" + across, "big") << 3
+            )
+            line[0::2] = mask.to_bytes(n, "big")
+            line[1::2] = across.translate(H_WALL)
+            lines.append(line.decode("latin-1").translate(GLYPHS))
+            if mi < m_h:
+                line[0::2] = vertical[mi + 1].translate(V_WALL)
+                line[1::2] = blank
+                lines.append(line.decode("latin-1").translate(GLYPHS))
+            above = below
+
+        self._lines = lines
+        logo_cells: list[tuple[int, int]] = []
+        for mi, row in enumerate(rows):
+            mj = row.find(15)
+            while mj != -1:
+                logo_cells.append((mj * 2 + 1, mi * 2 + 1))
+                mj = row.find(15, mj + 1)
+        self._logo_cells = logo_cells
+
+    def _trace(self) -> None:
+        """Walk the solution once and record the cells it covers.
+
+        `_strokes` keeps the cells of every straight stretch of the
+        path in order, for the animation; `_runs` groups the same
+        cells into horizontal runs, sorted by row, so a refresh draws
+        each run with one cursor move.
+        """
+        strokes: list[list[tuple[int, int]]] = []
+        runs: list[tuple[int, int, int]] = []
+        moves = {"N": (0, -1), "S": (0, 1), "E": (1, 0), "W": (-1, 0)}
+        x = self.start.x * 2 + 1
+        y = self.start.y * 2 + 1
+        by_row: dict[int, list[int]] = {}
+        heading = ""
+        for c in self.path:
+            if c not in moves:
+                continue
+            dx, dy = moves[c]
+            step = ((x + dx, y + dy), (x + dx * 2, y + dy * 2))
+            if c != heading:
+                heading = c
+                strokes.append([])
+            strokes[-1].extend(step)
+            for px, py in step:
+                by_row.setdefault(py, []).append(px)
+            x += dx * 2
+            y += dy * 2
+        for py, xs in sorted(by_row.items()):
+            xs.sort()
+            first = last = xs[0]
+            for px in xs[1:]:
+                if px != last + 1:
+                    runs.append((first, py, last - first + 1))
+                    first = px
+                last = px
+            runs.append((first, py, last - first + 1))
+        self._strokes = strokes
+        self._runs = runs
+
+    def _compose(self, path: bool = True) -> list[str]:
+        """Build the visible rows of the maze as they should look.
+
+        Each row is the viewport's slice of the cached wall row with
+        the logo, the S/E markers and the path laid over it, colors
+        included, so two frames can be compared row by row.
+
+        Args:
+            path: Lay the solution path over the walls.
+
+        Returns:
+            Screen rows from the top of the viewport.
+        """
+        off_x, off_y = self._off_x, self._off_y
+        view_w, view_h = self._view_w, self._view_h
+        wall = Graphics.set(self.wall_color)
+        logo = Graphics.set(self.logo_color)
+        trail = Graphics.set(self.path_color)
+        plain = Graphics.reset()
+        # Glyphs drawn over the walls: screen row -> column -> style
+        # and character, later layers replacing earlier ones
+        marks: dict[int, dict[int, tuple[str, str]]] = {}
+
+        def put(x: int, y: int, style: str, char: str) -> None:
+            sx, sy = x - off_x, y - off_y
+            if 0 <= sx < view_w and 0 <= sy < view_h:
+                marks.setdefault(sy, {})[sx] = (style, char)
+
+        # Logo cells and path runs are sorted by row, so only the rows
+        # inside the viewport are visited
+        row_of = itemgetter(1)
+        cells = self._logo_cells
+        first = bisect_left(cells, off_y, key=row_of)
+        last = bisect_left(cells, off_y + view_h, key=row_of)
+        for x, y in cells[first:last]:
+            put(x, y, logo, "█")
+        put(self.start.x * 2 + 1, self.start.y * 2 + 1, plain, "S")
+        if path:
+            symbol = self.path_symbol
+            runs = self._runs
+            first = bisect_left(runs, off_y, key=row_of)
+            last = bisect_left(runs, off_y + view_h, key=row_of)
+            mark = (trail, symbol)
+            for px, py, n in runs[first:last]:
+                # Clip the run to the viewport up front instead of
+                # testing every cell
+                lo = max(px - off_x, 0)
+                hi = min(px + n - off_x, view_w)
+                if lo < hi:
+                    cols = marks.setdefault(py - off_y, {})
+                    for sx in range(lo, hi):
+                        cols[sx] = mark
+        put(self.end.x * 2 + 1, self.end.y * 2 + 1, plain, "E")
+
+        rows: list[str] = []
+        add_row = rows.append
+        marks_in = marks.get
+        end = min(off_y + view_h, len(self._lines))
+        for sy, line in enumerate(self._lines[off_y:end]):
+            text = line[off_x:off_x + view_w]
+            row_marks = marks_in(sy)
+            if not row_marks:
+                add_row(wall + text + plain)
+                continue
+            parts: list[str] = []
+            add = parts.append
+            style = ""
+            last = 0
+            for sx in sorted(row_marks):
+                if last < sx:
+                    if style != wall:
+                        style = wall
+                        add(wall)
+                    add(text[last:sx])
+                mark_style, char = row_marks[sx]
+                if style != mark_style:
+                    style = mark_style
+                    add(mark_style)
+                add(char)
+                last = sx + 1
+            if last < len(text):
+                if style != wall:
+                    add(wall)
+                add(text[last:])
+            add(plain)
+            add_row("".join(parts))
+        return rows
+
+    def _draw(self, rows: list[str]) -> None:
+        """Print the rows that differ from what is on screen.
+
+        `_shown` holds the rows of the previous frame, so a frame only
+        costs the rows it changes: recoloring the path rewrites the
+        rows it crosses and leaves the others alone.
+
+        Args:
+            rows: Screen rows from _compose().
+        """
+        emit = self._buf.append
+        move_to = Visualizer.Cursor.move_to
+        shown = self._shown
+        for sy, row in enumerate(rows):
+            if sy >= len(shown) or shown[sy] != row:
+                emit(move_to(0, sy) + row)
+        self._shown = rows
+
+    def _animate_path(self) -> None:
+        """Draw the solution path one straight stroke at a time.
+
+        The frame so far and then every stroke are flushed as they are
+        drawn, with one pause per stroke rather than per move. The
+        cursor position is tracked, so a glyph that follows the
+        previous one on the same row needs no cursor move.
+        """
+        emit = self._buf.append
+        move_to = Visualizer.Cursor.move_to
+        symbol = self.path_symbol
+        at = (-1, -1)
+        emit(Graphics.set(self.path_color))
+        for stroke in self._strokes:
+            for px, py in stroke:
+                sx, sy = self._to_screen(px, py)
+                if self._in_view(sx, sy):
+                    if (sx, sy) != at:
+                        emit(move_to(sx, sy))
+                    emit(symbol)
+                    at = (sx + 1, sy)
+            self._flush()
+            sleep(0.02)
+        emit(Graphics.reset())
+
+    def _flush(self) -> None:
+        """Write the buffered output in one call and empty the buffer."""
+        stdout.write("".join(self._buf))
+        stdout.flush()
+        self._buf.clear()
 
     def render(self) -> tuple[bool, int | None]:
         """Render and interact with maze visualization.
@@ -315,246 +788,113 @@ class Visualizer:
         """
         term = Visualizer.Terminal()
         cursor = Visualizer.Cursor()
-        N = 0b0001
-        E = 0b0010
-        S = 0b0100
-        W = 0b1000
-        m_h = len(self.maze)
-        m_w = len(self.maze[0])
-        out = [[" " for _ in range(m_w * 2 + 1)] for _ in range(m_h * 2 + 1)]
-
-        # Viewport offsets (top-left corner in `out`)
-        off_x = 0
-        off_y = 0
-
-        # Viewport size (computed on refresh)
-        view_w = term.width
-        view_h = max(1, term.height - 3)
-
-        def clamp_offsets() -> None:
-            nonlocal off_x, off_y
-            out_h = len(out)
-            out_w = len(out[0]) if out else 0
-            max_off_x = max(0, out_w - view_w)
-            max_off_y = max(0, out_h - view_h)
-            if off_x < 0:
-                off_x = 0
-            elif off_x > max_off_x:
-                off_x = max_off_x
-            if off_y < 0:
-                off_y = 0
-            elif off_y > max_off_y:
-                off_y = max_off_y
-
-        def to_screen(x: int, y: int) -> tuple[int, int]:
-            return x - off_x, y - off_y
-
-        def in_view(sx: int, sy: int) -> bool:
-            return 0 <= sx < view_w and 0 <= sy < view_h
-
-        def _walls() -> None:
-            """
-            Render maze walls and junctions into `out` then print viewport.
-            """
-            checks = [
-                (-1, 0, "│"),
-                (0, 1, "─"),
-                (1, 0, "│"),
-                (0, -1, "─"),
-            ]
-            junction_map = {
-                1: "╵",
-                2: "╶",
-                3: "╰",
-                4: "╷",
-                5: "│",
-                6: "╭",
-                7: "├",
-                8: "╴",
-                9: "╯",
-                10: "─",
-                11: "┴",
-                12: "╮",
-                13: "┤",
-                14: "┬",
-                15: "┼",
-            }
-
-            # reset out
-            for i in range(len(out)):
-                for j in range(len(out[i])):
-                    out[i][j] = " "
-
-            for mi in range(m_h):
-                for mj in range(m_w):
-                    i = mi * 2 + 1
-                    j = mj * 2 + 1
-                    cell = self.maze[mi][mj].walls
-                    if cell & N:
-                        out[i - 1][j] = "─"
-                    if cell & S:
-                        out[i + 1][j] = "─"
-                    if cell & E:
-                        out[i][j + 1] = "│"
-                    if cell & W:
-                        out[i][j - 1] = "│"
-
-            for i in range(0, m_h * 2 + 1, 2):
-                for j in range(0, m_w * 2 + 1, 2):
-                    mask = 0
-                    for bit, (di, dj, char) in enumerate(checks):
-                        ni, nj = i + di, j + dj
-                        if 0 <= ni < len(out) and 0 <= nj < len(out[ni]):
-                            if out[ni][nj] == char:
-                                mask |= 1 << bit
-                    out[i][j] = junction_map.get(mask, " ")
-            Graphics.set(self.wall_color)
-            for row_i in range(off_y, min(off_y + view_h, len(out))):
-                stdout.write("".join(out[row_i][off_x:off_x + view_w]) + "\n")
-            Graphics.reset()
-
-        def _logo() -> None:
-            """
-            Render logo (filled cells with all walls) inside viewport.
-            """
-            Graphics.set(self.logo_color)
-            for mi in range(m_h):
-                for mj in range(m_w):
-                    i = mi * 2 + 1
-                    j = mj * 2 + 1
-                    if self.maze[mi][mj].walls == 15:
-                        sx, sy = to_screen(j, i)
-                        if in_view(sx, sy):
-                            cursor.move_to(sx, sy)
-                            stdout.write("█")
-            Graphics.reset()
-
-        def _path(animate: bool = False) -> None:
-            """
-            Render solution path through maze (viewport-aware, continuous).
-            """
-            x = self.start.x * 2 + 1
-            y = self.start.y * 2 + 1
-
-            def draw(px: int, py: int) -> None:
-                sx = px - off_x
-                sy = py - off_y
-                if 0 <= sx < view_w and 0 <= sy < view_h:
-                    cursor.move_to(sx, sy)
-                    stdout.write(self.path_symbol)
-
-            Graphics.set(self.path_color)
-
-            for c in self.path:
-                if c == "N":
-                    draw(x, y - 1)
-                    draw(x, y - 2)
-                    y -= 2
-                elif c == "S":
-                    draw(x, y + 1)
-                    draw(x, y + 2)
-                    y += 2
-                elif c == "E":
-                    draw(x + 1, y)
-                    draw(x + 2, y)
-                    x += 2
-                elif c == "W":
-                    draw(x - 1, y)
-                    draw(x - 2, y)
-                    x -= 2
-
-                stdout.flush()
-                if animate:
-                    sleep(0.02)
-            Graphics.reset()
+        emit = self._buf.append
+        self._off_x = 0
+        self._off_y = 0
 
         kbd = Visualizer.Keyboard()
         mode = Visualizer.Keyboard.enable_raw_mode()
+        # What the next frame redraws: everything (new viewport), the
+        # maze in place (same layout, new colors or path symbol), or
+        # only the menu line
         refresh = True
+        repaint = False
+        menu_changed = False
+        # Terminal size the screen was last cleared for
+        size: tuple[int, int] | None = None
         menu_type = "Main"
-        menu: Any = Visualizer.menu
-        term.enter_alternate()
+        # The cursor stays hidden and lines do not wrap until render()
+        # returns; _draw() relies on rows staying where they were drawn
+        stdout.write(
+            term.enter_alternate() + cursor.hide() + term.disable_wrap()
+        )
 
         try:
             while True:
-                if refresh:
-                    term.update()
-                    view_w = max(1, term.width)
-                    menu_lines = 3
-                    view_h = max(1, term.height - menu_lines)
-                    clamp_offsets()
-
-                    term.clear()
-                    cursor.hide()
-                    cursor.home()
-                    _walls()
-                    _logo()
-                    if self.width <= 18 or self.height <= 18:
-                        cursor.move_to(0, term.height - 3)
-                        Graphics.set(Graphics.Color.Yellow)
-                        msg = "⚠️ Info: Maze too small for the 42 pattern"
-                        stdout.write(msg)
-                        Graphics.reset()
-                    cursor.move_to(0, term.height - 2)
-                    stdout.write("─" * term.width)
-                    for item in menu[menu_type]:
-                        Graphics.menu(item)
-                        stdout.write("    ")
-
-                    # Draw E/S if visible
-                    ex = self.end.x * 2 + 1
-                    ey = self.end.y * 2 + 1
-                    sx0 = self.start.x * 2 + 1
-                    sy0 = self.start.y * 2 + 1
-
-                    e_scr_x, e_scr_y = to_screen(ex, ey)
-                    s_scr_x, s_scr_y = to_screen(sx0, sy0)
-
-                    if in_view(s_scr_x, s_scr_y):
-                        cursor.move_to(s_scr_x, s_scr_y)
-                        stdout.write("S")
-
-                    if not self.path_drawn:
-                        _path(animate=True)
-                        self.path_drawn = True
-                    else:
-                        _path()
-
-                    if in_view(e_scr_x, e_scr_y):
-                        cursor.move_to(e_scr_x, e_scr_y)
-                        stdout.write("E")
-
-                    stdout.flush()
-                    refresh = False
-
-                key = kbd.get_key()
+                if refresh or repaint or menu_changed:
+                    emit(term.begin_sync())
+                    if refresh:
+                        term.update()
+                        self._view_w = max(1, term.width)
+                        menu_lines = 3
+                        self._view_h = max(1, term.height - menu_lines)
+                        self._clamp_offsets()
+
+                        # Frames overwrite each other in place; the
+                        # screen is only cleared on the first frame and
+                        # when the terminal was resized
+                        if size != (term.width, term.height):
+                            size = (term.width, term.height)
+                            emit(term.clear())
+                            self._shown = []
+                            self._fit_menus(term.width)
+                            menu_changed = True
+                    if menu_changed:
+                        # The info line and the divider are rewritten
+                        # with the menu, so nothing left on those rows
+                        # outlives a menu switch
+                        emit(cursor.move_to(0, term.height - 3))
+                        emit(cursor.clear_line())
+                        if self.width <= 18 or self.height <= 18:
+                            emit(Graphics.set(Graphics.Color.Yellow))
+                            emit("⚠️ Info: Maze too small for the 42 pattern")
+                            emit(Graphics.reset())
+                        emit(cursor.move_to(0, term.height - 2))
+                        emit("─" * term.width)
+                    emit(cursor.move_to(0, term.height - 1))
+                    emit(cursor.clear_line())
+                    emit(self._menu_lines[menu_type])
+
+                    if refresh or repaint:
+                        if not self.path_drawn:
+                            # Show the maze before the path is drawn over
+                            # it, then put E back on top of the path
+                            self._draw(self._compose(path=False))
+                            emit(term.end_sync())
+                            self._animate_path()
+                            ex, ey = self._to_screen(
+                                self.end.x * 2 + 1, self.end.y * 2 + 1
+                            )
+                            if self._in_view(ex, ey):
+                                emit(cursor.move_to(ex, ey) + "E")
+                            self._shown = self._compose()
+                            self.path_drawn = True
+                        else:
+                            self._draw(self._compose())
+
+                    emit(term.end_sync())
+                    self._flush()
+                    refresh = repaint = menu_changed = False
+
+                # Nothing changes on screen until a key is pressed
+                key = kbd.get_key(None)
                 if key:
                     match key.lower():
                         case "q":
                             return False, None
 
                         # Viewport panning with arrow keys
+                        # (offsets are clamped on refresh)
                         case "up":
-                            off_y = max(0, off_y - 1)
+                            self._off_y -= 1
                             refresh = True
                         case "down":
-                            out_h = len(out)
-                            max_off_y = max(0, out_h - view_h)
-                            off_y = min(max_off_y, off_y + 1)
+                            self._off_y += 1
                             refresh = True
                         case "left":
-                            off_x = max(0, off_x - 2)
+                            self._off_x -= 2
                             refresh = True
                         case "right":
-                            out_w = len(out[0]) if out else 0
-                            max_off_x = max(0, out_w - view_w)
-                            off_x = min(max_off_x, off_x + 2)
+                            self._off_x += 2
                             refresh = True
 
                         case "n" if menu_type == "Main":
-                            cursor.move_to(0, term.height - 1)
-                            cursor.clear_line()
-                            cursor.show()
+                            stdout.write(
+                                cursor.move_to(0, term.height - 1)
+                                + cursor.clear_line()
+                                + cursor.show()
+                                + term.enable_wrap()
+                            )
                             Visualizer.Keyboard.disable_raw_mode(mode)
                             seed_msg = "Enter seed or press 'Enter' for None: "
                             while True:
@@ -568,123 +908,33 @@ class Visualizer:
                             return True, new_seed_value
                         case "c" if menu_type == "Main":
                             menu_type = "Color"
-                            refresh = True
+                            menu_changed = True
                         case "p" if menu_type == "Main":
                             if self.path_symbol == "░":
                                 self.path_symbol = " "
                             else:
                                 self.path_symbol = "░"
-                            refresh = True
-                        case "w" if menu_type == "Color":
-                            menu = Visualizer.menu["Color"]
-                            menu_type = "Walls"
-                            refresh = True
-                        case "p" if menu_type == "Color":
-                            menu = Visualizer.menu["Color"]
-                            menu_type = "Path"
-                            refresh = True
-                        case "l" if menu_type == "Color":
-                            menu = Visualizer.menu["Color"]
-                            menu_type = "Logo"
-                            refresh = True
-
-                        # Walls color handling
-                        case "r" if menu_type == "Walls":
-                            self.wall_color = Graphics.Color.Red
-                            menu = Visualizer.menu
-                            menu_type = "Main"
-                            refresh = True
-                        case "g" if menu_type == "Walls":
-                            self.wall_color = Graphics.Color.Green
-                            menu = Visualizer.menu
-                            menu_type = "Main"
-                            refresh = True
-                        case "y" if menu_type == "Walls":
-                            self.wall_color = Graphics.Color.Yellow
-                            menu = Visualizer.menu
+                            repaint = True
+                        case k if (
+                            menu_type == "Color" and k in Visualizer.submenus
+                        ):
+                            menu_type = Visualizer.submenus[k]
+                            menu_changed = True
+                        case k if (
+                            menu_type in Visualizer.color_targets
+                            and k in Visualizer.color_keys
+                        ):
+                            setattr(
+                                self,
+                                Visualizer.color_targets[menu_type],
+                                Visualizer.color_keys[k],
+                            )
                             menu_type = "Main"
-                            refresh = True
-                        case "b" if menu_type == "Walls":
-                            self.wall_color = Graphics.Color.Blue
-                            menu = Visualizer.menu
-                            menu_type = "Main"
-                            refresh = True
-                        case "m" if menu_type == "Walls":
-                            self.wall_color = Graphics.Color.Magenta
-                            menu = Visualizer.menu
-                            menu_type = "Main"
-                            refresh = True
-                        case "c" if menu_type == "Walls":
-                            self.wall_color = Graphics.Color.Cyan
-                            menu = Visualizer.menu
-                            menu_type = "Main"
-                            refresh = True
-
-                        # Path color handling
-                        case "r" if menu_type == "Path":
-                            self.path_color = Graphics.Color.Red
-                            menu = Visualizer.menu
-                            menu_type = "Main"
-                            refresh = True
-                        case "g" if menu_type == "Path":
-                            self.path_color = Graphics.Color.Green
-                            menu = Visualizer.menu
-                            menu_type = "Main"
-                            refresh = True
-                        case "y" if menu_type == "Path":
-                            self.path_color = Graphics.Color.Yellow
-                            menu = Visualizer.menu
-                            menu_type = "Main"
-                            refresh = True
-                        case "b" if menu_type == "Path":
-                            self.path_color = Graphics.Color.Blue
-                            menu = Visualizer.menu
-                            menu_type = "Main"
-                            refresh = True
-                        case "m" if menu_type == "Path":
-                            self.path_color = Graphics.Color.Magenta
-                            menu = Visualizer.menu
-                            menu_type = "Main"
-                            refresh = True
-                        case "c" if menu_type == "Path":
-                            self.path_color = Graphics.Color.Cyan
-                            menu = Visualizer.menu
-                            menu_type = "Main"
-                            refresh = True
-
-                        # Logo color handling
-                        case "r" if menu_type == "Logo":
-                            self.logo_color = Graphics.Color.Red
-                            menu = Visualizer.menu
-                            menu_type = "Main"
-                            refresh = True
-                        case "g" if menu_type == "Logo":
-                            self.logo_color = Graphics.Color.Green
-                            menu = Visualizer.menu
-                            menu_type = "Main"
-                            refresh = True
-                        case "y" if menu_type == "Logo":
-                            self.logo_color = Graphics.Color.Yellow
-                            menu = Visualizer.menu
-                            menu_type = "Main"
-                            refresh = True
-                        case "b" if menu_type == "Logo":
-                            self.logo_color = Graphics.Color.Blue
-                            menu = Visualizer.menu
-                            menu_type = "Main"
-                            refresh = True
-                        case "m" if menu_type == "Logo":
-                            self.logo_color = Graphics.Color.Magenta
-                            menu = Visualizer.menu
-                            menu_type = "Main"
-                            refresh = True
-                        case "c" if menu_type == "Logo":
-                            self.logo_color = Graphics.Color.Cyan
-                            menu = Visualizer.menu
-                            menu_type = "Main"
-                            refresh = True
+                            repaint = True
 
         finally:
             Visualizer.Keyboard.disable_raw_mode(mode)
-            cursor.show()
-            term.exit_alternate()
+            stdout.write(
+                term.enable_wrap() + cursor.show() + term.exit_alternate()
+            )
+            stdout.flush()